@@ -210,9 +210,9 @@ class Client:
         :type data: dict[str, Any]
         :rtype: None
         """
-        self.state.queue = [Entry(**entry) for entry in data["queue"]]
-        self.state.waiting_room = [Entry(**entry) for entry in data["waiting_room"]]
-        self.state.recent = [Entry(**entry) for entry in data["recent"]]
+        self.state.queue = Entry.from_dicts(data["queue"])
+        self.state.waiting_room = Entry.from_dicts(data["waiting_room"])
+        self.state.recent = Entry.from_dicts(data["recent"])
 
         for pos, entry in enumerate(self.state.queue[0 : self.buffer_in_advance]):
             logger.info("Buffering: %s", entry.title)
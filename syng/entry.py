@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import fields
 import re
-from typing import Any
+from typing import Any, Iterable
 from typing import Optional
 from uuid import UUID
 from uuid import uuid4
@@ -73,6 +74,44 @@ class Entry:
         """
         self.__dict__.update(kwargs)
 
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the dictionary representation of the entry.
+
+        Unlike :py:func:`dataclasses.asdict`, the values are not copied
+        recursively, since all fields are immutable.
+
+        :return: A dictionary with all fields of the entry
+        :rtype: dict[str, Any]
+        """
+        return {name: self.__dict__[name] for name in _ENTRY_FIELD_NAMES}
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[dict[str, Any]]) -> list[Entry]:
+        """
+        Construct entries from their dictionary representations.
+
+        Rows, that contain exactly the fields of an entry (e.g. entries, that
+        were serialized by the server or a client) are assigned directly,
+        without going through ``__init__``. All other rows are passed to the
+        constructor, so that defaults are applied and unknown keys are
+        rejected.
+
+        :param rows: The dictionaries describing the entries
+        :type rows: Iterable[dict[str, Any]]
+        :return: The list of entries, in the same order
+        :rtype: list[Entry]
+        """
+        entries = []
+        for row in rows:
+            if row.keys() == _ENTRY_FIELDS:
+                entry = object.__new__(cls)
+                entry.__dict__.update(row)
+            else:
+                entry = cls(**row)
+            entries.append(entry)
+        return entries
+
     def shares_performer(self, other_performer: str) -> bool:
         """
         Check if this entry shares a performer with another entry.
@@ -83,23 +122,39 @@ class Entry:
         :rtype: bool
         """
 
-        def normalize(performers: str) -> set[str]:
-            return set(
-                filter(
-                    lambda x: len(x) > 0 and x not in ["der", "die", "das", "alle", "und"],
-                    re.sub(
-                        r"[^a-zA-Z0-9\s]",
-                        "",
-                        re.sub(
-                            r"\s",
-                            " ",
-                            performers.lower().replace(".", " ").replace(",", " "),
-                        ),
-                    ).split(" "),
-                )
-            )
-
-        e1_split_names = normalize(self.performer)
-        e2_split_names = normalize(other_performer)
+        e1_split_names = normalize_performers(self.performer)
+        e2_split_names = normalize_performers(other_performer)
 
         return len(e1_split_names.intersection(e2_split_names)) > 0
+
+
+_ENTRY_FIELD_NAMES = tuple(f.name for f in fields(Entry))
+_ENTRY_FIELDS = frozenset(_ENTRY_FIELD_NAMES)
+
+
+def normalize_performers(performers: str) -> set[str]:
+    """
+    Split a performer string into a set of normalized names.
+
+    Two performer strings share a performer, if their normalized names
+    intersect.
+
+    :param performers: The performer string, e.g. "Alice und Bob"
+    :type performers: str
+    :return: The set of normalized names
+    :rtype: set[str]
+    """
+    return set(
+        filter(
+            lambda x: len(x) > 0 and x not in ["der", "die", "das", "alle", "und"],
+            re.sub(
+                r"[^a-zA-Z0-9\s]",
+                "",
+                re.sub(
+                    r"\s",
+                    " ",
+                    performers.lower().replace(".", " ").replace(",", " "),
+                ),
+            ).split(" "),
+        )
+    )
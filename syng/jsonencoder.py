@@ -1,10 +1,23 @@
-"""Wraps the ``json`` module, so that own classes get encoded."""
+"""
+Wraps the ``json`` module, so that own classes get encoded.
+
+If ``orjson`` is installed, it is used for encoding and decoding instead.
+"""
 
 import json
 from dataclasses import asdict
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    if TYPE_CHECKING:
+        import orjson
+    ORJSON_AVAILABLE = False
+
 from .entry import Entry
 from .queue import Queue
 from .result import Result
@@ -23,21 +36,58 @@ class SyngEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
         """Implement the encoding."""
         if isinstance(o, Entry):
-            return asdict(o)
+            return o.to_dict()
         if isinstance(o, UUID):
             return str(o)
         if isinstance(o, Result):
             return asdict(o)
         if isinstance(o, Queue):
-            return o.to_list()
+            return list(o)
         return json.JSONEncoder.default(self, o)
 
 
+def _orjson_default(o: Any) -> Any:
+    """
+    Encode the objects, that ``orjson`` does not handle natively.
+
+    Dataclasses are passed through to this function, so that they are
+    encoded like in :py:class:`SyngEncoder`, e.g. only the fields of an
+    :py:class:`Entry` are sent, even if it carries additional attributes.
+    UUIDs are supported by ``orjson`` itself.
+    """
+    if isinstance(o, Entry):
+        return o.to_dict()
+    if isinstance(o, Result):
+        return asdict(o)
+    if isinstance(o, Queue):
+        return list(o)
+    raise TypeError
+
+
 def dumps(obj: Any, **kw: Any) -> str:
-    """Wrap around ``json.dump`` with the :py:class:`SyngEncoder`."""
+    """
+    Wrap around ``json.dump`` with the :py:class:`SyngEncoder`.
+
+    If ``orjson`` is available, it is used instead. ``orjson`` always
+    produces compact output, so the keyword arguments are ignored in that
+    case. Non string keys are converted to strings, as ``json`` does.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=_orjson_default,
+            option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS,
+        ).decode()
     return json.dumps(obj, cls=SyngEncoder, **kw)
 
 
 def loads(string: str, **kw: Any) -> Any:
-    """Forward everything to ``json.loads``."""
+    """
+    Forward everything to ``json.loads``.
+
+    If ``orjson`` is available and no keyword arguments are given, it is used
+    instead.
+    """
+    if ORJSON_AVAILABLE and not kw:
+        return orjson.loads(string)
     return json.loads(string, **kw)
@@ -62,12 +62,12 @@ except ImportError:
     CLIENT_AVAILABLE = False
 
 try:
-    from .server import run_server
+    from .server import run_server, DEFAULT_SEARCH_TIMEOUT
 
     SERVER_AVAILABLE = True
 except ImportError:
     if TYPE_CHECKING:
-        from .server import run_server
+        from .server import run_server, DEFAULT_SEARCH_TIMEOUT
 
     SERVER_AVAILABLE = False
 
@@ -110,6 +110,9 @@ def main() -> None:
         server_parser.add_argument("--private", "-P", action="store_true", default=False)
         server_parser.add_argument("--restricted", "-R", action="store_true", default=False)
         server_parser.add_argument("--admin-password", "-A", default=None)
+        server_parser.add_argument("--search-timeout", type=float, default=DEFAULT_SEARCH_TIMEOUT)
+        server_parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default="auto")
+        server_parser.add_argument("--debug", "-d", action="store_true", default=False)
 
     args = parser.parse_args()
 
@@ -2,18 +2,22 @@
 
 import asyncio
 from collections import deque
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from .entry import Entry
+from .entry import Entry, normalize_performers
 
 
 class Queue:
     """A async queue with synchronization.
 
-    This queue keeps track of the amount of entries by using a semaphore.
+    Waiting for entries is done with an event, that is set, if and only if
+    the queue is not empty.
+
+    Entries are indexed by their uuid. An entry, that is added with the uuid
+    of an entry already in the queue, gets a new uuid.
 
     :param initial_entries: Initial list of entries to add to the queue
     :type initial_entries: list[Entry]
@@ -21,26 +25,59 @@ class Queue:
 
     def __init__(self, initial_entries: list[Entry]):
         """
-        Construct the queue. And initialize the internal lock and semaphore.
+        Construct the queue. And initialize the internal lock and event.
 
         :param initial_entries: Initial list of entries to add to the queue
         :type initial_entries: list[Entry]
         """
         self._queue = deque(initial_entries)
-
-        self.num_of_entries_sem = asyncio.Semaphore(len(self._queue))
+        self._by_performer: dict[str, list[Entry]] = {}
+        self._by_uuid: dict[str, Entry] = {}
+        self._total_duration = 0
+        for entry in self._queue:
+            self._add_to_index(entry)
+
+        self.nonempty = asyncio.Event()
+        if self._queue:
+            self.nonempty.set()
         self.readlock = asyncio.Lock()
 
+    def _add_to_index(self, entry: Entry) -> None:
+        """
+        Account for a new entry in the performer and uuid index.
+
+        If another entry with the same uuid is already indexed, the new entry
+        gets a fresh uuid, so that every entry in the queue can be found.
+        """
+        for name in normalize_performers(entry.performer):
+            self._by_performer.setdefault(name, []).append(entry)
+        if str(entry.uuid) in self._by_uuid:
+            entry.uuid = uuid4()
+        self._by_uuid[str(entry.uuid)] = entry
+        self._total_duration += entry.duration
+
+    def _remove_from_index(self, entry: Entry) -> None:
+        """Remove an entry, that left the queue, from the performer and uuid index."""
+        del self._by_uuid[str(entry.uuid)]
+        self._total_duration -= entry.duration
+        for name in normalize_performers(entry.performer):
+            entries = [item for item in self._by_performer[name] if item is not entry]
+            if entries:
+                self._by_performer[name] = entries
+            else:
+                del self._by_performer[name]
+
     def append(self, entry: Entry) -> None:
         """
-        Append an entry to the queue, increase the semaphore.
+        Append an entry to the queue and signal waiting readers.
 
         :param entry: The entry to add
         :type entry: Entry
         :rtype: None
         """
         self._queue.append(entry)
-        self.num_of_entries_sem.release()
+        self._add_to_index(entry)
+        self.nonempty.set()
 
     def try_peek(self) -> Optional[Entry]:
         """Return the first entry in the queue, if it exists."""
@@ -58,26 +95,58 @@ class Queue:
         :rtype: Entry
         """
         async with self.readlock:
-            await self.num_of_entries_sem.acquire()
+            while not self._queue:
+                await self.nonempty.wait()
             item = self._queue[0]
-            self.num_of_entries_sem.release()
         return item
 
     async def popleft(self) -> Entry:
         """
         Remove the first entry in the queue and return it.
 
-        Decreases the semaphore. If the queue is empty, wait until the queue
-        has at least one entry.
+        If the queue is empty, wait until the queue has at least one entry.
 
         :returns: First entry of the queue
         :rtype: Entry
         """
         async with self.readlock:
-            await self.num_of_entries_sem.acquire()
+            while not self._queue:
+                await self.nonempty.wait()
             item = self._queue.popleft()
+            self._remove_from_index(item)
+            if not self._queue:
+                self.nonempty.clear()
         return item
 
+    def __iter__(self) -> Iterator[Entry]:
+        """
+        Iterate over all entries in the queue, without copying them.
+
+        :returns: An iterator over the entries.
+        :rtype: Iterator[Entry]
+        """
+        return iter(self._queue)
+
+    def __len__(self) -> int:
+        """
+        Return the number of entries in the queue.
+
+        :rtype: int
+        """
+        return len(self._queue)
+
+    @property
+    def total_duration(self) -> int:
+        """
+        The sum of the durations of all entries in the queue.
+
+        This is kept up to date on every change of the queue, so it can be
+        read without iterating over the entries.
+
+        :rtype: int
+        """
+        return self._total_duration
+
     def to_list(self) -> list[Entry]:
         """
         Return all entries in a list.
@@ -94,7 +163,8 @@ class Queue:
         """
         Update entries in the queue, identified by their uuid.
 
-        If an entry with that uuid is not in the queue, nothing happens.
+        If an entry with that uuid is not in the queue, nothing happens. The
+        entry is indexed again, even if the updater raises.
 
         :param uuid: The uuid of the entry to update
         :type uuid: UUID | str
@@ -102,23 +172,49 @@ class Queue:
         :type updater: Callable[[Entry], None]
         :rtype: None
         """
-        for item in self._queue:
-            if item.uuid == uuid or str(item.uuid) == uuid:
+        item = self._by_uuid.get(str(uuid))
+        if item is not None:
+            self._remove_from_index(item)
+            try:
                 updater(item)
+            finally:
+                self._add_to_index(item)
 
     def find_by_name(self, name: str) -> Optional[Entry]:
         """
         Find an entry by its performer and return it.
 
+        The candidates are taken from the performer index, so the queue is
+        only scanned for the first of them and no performer is normalized
+        per entry.
+
         :param name: The name of the performer to search for.
         :type name: str
         :returns: The entry with the performer or `None` if no such entry exists
         :rtype: Optional[Entry]
         """
-        for item in self._queue:
-            if item.shares_performer(name):
-                return item
-        return None
+        candidates = {
+            id(item)
+            for performer in normalize_performers(name)
+            for item in self._by_performer.get(performer, ())
+        }
+        if not candidates:
+            return None
+        return next((item for item in self._queue if id(item) in candidates), None)
+
+    def has_performer(self, name: str) -> bool:
+        """
+        Check if an entry in the queue shares a performer with ``name``.
+
+        This is answered from an index of the normalized performer names, and
+        does not need to look at the entries themselves.
+
+        :param name: The name of the performer to search for.
+        :type name: str
+        :returns: True, if an entry with the performer exists
+        :rtype: bool
+        """
+        return not self._by_performer.keys().isdisjoint(normalize_performers(name))
 
     def find_by_uuid(self, uuid: UUID | str) -> Optional[Entry]:
         """
@@ -129,10 +225,7 @@ class Queue:
         :returns: The entry with the uuid or `None` if no such entry exists
         :rtype: Optional[Entry]
         """
-        for item in self._queue:
-            if item.uuid == uuid or str(item.uuid) == uuid:
-                return item
-        return None
+        return self._by_uuid.get(str(uuid))
 
     def find_by_uid(self, uid: str) -> Iterable[Entry]:
         """
@@ -151,15 +244,48 @@ class Queue:
 
     async def remove(self, entry: Entry) -> None:
         """
-        Remove an entry, if it exists. Decrease the semaphore.
+        Remove an entry, if it exists.
+
+        The entry is located by identity, so the (field by field) equality
+        of entries is never evaluated.
 
         :param entry: The entry to remove
         :type entry: Entry
         :rtype: None
         """
         async with self.readlock:
-            await self.num_of_entries_sem.acquire()
-            self._queue.remove(entry)
+            if self._by_uuid.get(str(entry.uuid)) is not entry:
+                return
+            if self._queue[0] is entry:
+                self._queue.popleft()
+            elif self._queue[-1] is entry:
+                self._queue.pop()
+            else:
+                del self._queue[self._index_of(entry)]
+            self._remove_from_index(entry)
+            if not self._queue:
+                self.nonempty.clear()
+
+    def _index_of(self, entry: Entry) -> int:
+        """
+        Find the position of a queued entry by identity.
+
+        Unlike ``deque.index`` this never falls back to the field by field
+        equality of other entries. The queue is walked from both ends at
+        once, so the search stops after at most half of the entries.
+
+        :param entry: An entry, that is part of the queue
+        :type entry: Entry
+        :returns: The position of the entry
+        :rtype: int
+        """
+        last = len(self._queue) - 1
+        for offset, (left, right) in enumerate(zip(self._queue, reversed(self._queue))):
+            if left is entry:
+                return offset
+            if right is entry:
+                return last - offset
+        raise ValueError("Entry is not in the queue")
 
     async def move_up(self, uuid: str) -> None:
         """
@@ -172,15 +298,14 @@ class Queue:
         :rtype: None
         """
         async with self.readlock:
-            uuid_idx = 0
-            for idx, item in enumerate(self._queue):
-                if item.uuid == uuid or str(item.uuid) == uuid:
-                    uuid_idx = idx
+            entry = self._by_uuid.get(str(uuid))
+            if entry is None:
+                return
+            uuid_idx = self._index_of(entry)
 
             if uuid_idx > 1:
-                tmp = self._queue[uuid_idx]
                 self._queue[uuid_idx] = self._queue[uuid_idx - 1]
-                self._queue[uuid_idx - 1] = tmp
+                self._queue[uuid_idx - 1] = entry
 
     async def move_to(self, uuid: str, target: int) -> None:
         """
@@ -194,14 +319,13 @@ class Queue:
         """
 
         async with self.readlock:
-            uuid_idx = 0
-            for idx, item in enumerate(self._queue):
-                if item.uuid == uuid or str(item.uuid) == uuid:
-                    uuid_idx = idx
+            entry = self._by_uuid.get(str(uuid))
+            if entry is None:
+                return
+            uuid_idx = self._index_of(entry)
 
             if uuid_idx != target:
-                entry = self._queue[uuid_idx]
-                self._queue.remove(entry)
+                del self._queue[uuid_idx]
 
                 if target > uuid_idx:
                     target = target - 1
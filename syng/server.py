@@ -16,14 +16,16 @@ from __future__ import annotations
 import asyncio
 import datetime
 import hashlib
+import heapq
+import hmac
 import os
 import random
 import string
+import time
 from json.decoder import JSONDecodeError
 from argparse import Namespace
 from dataclasses import dataclass
-from dataclasses import field
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 from typing import AsyncGenerator
 from typing import Optional
 
@@ -31,6 +33,15 @@ import socketio
 from aiohttp import web
 from profanity_check import predict
 
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    if TYPE_CHECKING:
+        import uvloop
+    UVLOOP_AVAILABLE = False
+
 from .result import Result
 
 from . import jsonencoder
@@ -46,22 +57,46 @@ DEFAULT_CONFIG = {
     "last_song": None,
 }
 
+DEFAULT_SEARCH_TIMEOUT = 30.0
+
+
+def _secret_matches(given: Any, expected: Any) -> bool:
+    """
+    Compare a secret sent by a client with the secret of a room.
+
+    The comparison runs in constant time, so the duration of a failed login
+    does not leak how much of the secret was correct. Secrets, that are not
+    strings, never match.
+
+    :param given: The secret sent by the client
+    :type given: Any
+    :param expected: The secret of the room
+    :type expected: Any
+    :return: True, if both secrets are equal, False otherwise
+    :rtype: bool
+    """
+    if not isinstance(given, str) or not isinstance(expected, str):
+        return False
+    return hmac.compare_digest(given.encode(), expected.encode())
+
 
 def with_state(handler: Callable[..., Any]) -> Callable[..., Any]:
     """
     Decorator that forwards the state of a room to a handler.
 
-    :param forward_room: Either the handler to decorate or a boolean
-        defining if the room should be forwarded.
-    :type forward_room: bool | Callable[..., Any]
-    :return: The decorated handler or a function that decorates a handler
-    :rtype: Callable[..., Any] | Callable[[Callable[..., Any]], Callable[..., Any]]
+    The room is looked up once per message, so :py:func:`admin` and
+    :py:func:`playback` can be stacked below this decorator without looking
+    it up again. The lookup uses the server's own mapping of session ids to
+    rooms, rather than the socket.io session.
+
+    :param handler: The handler to decorate
+    :type handler: Callable[..., Any]
+    :return: The decorated handler
+    :rtype: Callable[..., Any]
     """
 
     async def wrapper(self: Server, sid: str, *args: Any, **kwargs: Any) -> Any:
-        async with self.sio.session(sid) as session:
-            room = session["room"]
-        state = self.clients[room]
+        state = self.clients[self.rooms_by_sid[sid]]
         return await handler(self, state, sid, *args, **kwargs)
 
     return wrapper
@@ -73,17 +108,20 @@ def admin(handler: Callable[..., Any]) -> Callable[..., Any]:
 
     If the client is not an admin, the handler is not called.
 
+    This needs to be applied below :py:func:`with_state`, so the wrapped
+    handler receives the already resolved state of the room.
+
     :param handler: The handler to decorate
     :type handler: Callable[..., Any]
     :return: The decorated handler
     :rtype: Callable[..., Any]
     """
 
-    async def wrapper(self: Server, sid: str, *args: Any, **kwargs: Any) -> Any:
-        async with self.sio.session(sid) as session:
-            if not session["admin"]:
-                await self.sio.emit("err", {"type": "NO_ADMIN"}, sid)
-        return await handler(self, sid, *args, **kwargs)
+    async def wrapper(self: Server, state: State, sid: str, *args: Any, **kwargs: Any) -> Any:
+        if sid not in self.admins:
+            await self.sio.emit("err", {"type": "NO_ADMIN"}, sid)
+            return None
+        return await handler(self, state, sid, *args, **kwargs)
 
     return wrapper
 
@@ -94,24 +132,24 @@ def playback(handler: Callable[..., Any]) -> Callable[..., Any]:
 
     If the client is not a playback client, the handler is not called.
 
+    This needs to be applied below :py:func:`with_state`, so the wrapped
+    handler receives the already resolved state of the room.
+
     :param handler: The handler to decorate
     :type handler: Callable[..., Any]
     :return: The decorated handler
     :rtype: Callable[..., Any]
     """
 
-    async def wrapper(self: Server, sid: str, *args: Any, **kwargs: Any) -> Any:
-        async with self.sio.session(sid) as session:
-            room = session["room"]
-        state = self.clients[room]
+    async def wrapper(self: Server, state: State, sid: str, *args: Any, **kwargs: Any) -> Any:
         if sid != state.sid:
-            return
-        return await handler(self, sid, *args, **kwargs)
+            return None
+        return await handler(self, state, sid, *args, **kwargs)
 
     return wrapper
 
 
-@dataclass
+@dataclass(eq=False)
 class Client:
     """This stores the configuration of a specific playback client.
 
@@ -121,8 +159,9 @@ class Client:
     :param sources: A dictionary mapping the name of the used sources to their
         instances.
     :type sources: Source
-    :param sources_prio: A list defining the order of the search results.
-    :type sources_prio: list[str]
+    :param sources_prio: The names of the sources in the order of the search
+        results.
+    :type sources_prio: tuple[str, ...]
     :param config: Various configuration options for the client:
         * `preview_duration` (`Optional[int]`): The duration in seconds the
             playback client shows a preview for the next song. This is accounted for
@@ -135,14 +174,36 @@ class Client:
                           to be put in the waiting room.
             - `None`, performers are always added to the queue.
     :type config: dict[str, Any]:
+    :ivar prio_sources: The configured sources in the order of
+        ``sources_prio``. Sources, that did not yet receive their
+        configuration, are left out.
+    :vartype prio_sources: list[Source]
     """
 
+    __slots__ = ("sources", "sources_prio", "config", "prio_sources")
+
     sources: dict[str, Source]
-    sources_prio: list[str]
+    sources_prio: tuple[str, ...]
     config: dict[str, Any]
 
+    def __post_init__(self) -> None:
+        self.update_prio_sources()
+
+    def update_prio_sources(self) -> None:
+        """
+        Recompute :py:attr:`prio_sources`.
+
+        This needs to be called, whenever ``sources`` or ``sources_prio``
+        change.
 
-@dataclass
+        :rtype: None
+        """
+        self.prio_sources: list[Source] = [
+            self.sources[name] for name in self.sources_prio if name in self.sources
+        ]
+
+
+@dataclass(eq=False)
 class State:
     """This defines the state of one session/room.
 
@@ -154,8 +215,9 @@ class State:
         taken from the top.
     :type queue: Queue
     :param waiting_room: Contains the Entries, that are hold back, until a
-        specific song is finished.
-    :type waiting_room: list[Entry]
+        specific song is finished. The entries are keyed by the string
+        representation of their uuid and kept in insertion order.
+    :type waiting_room: dict[str, Entry]
     :param recent: A list of already played songs in order.
     :type recent: list[Entry]
     :param sid: The socket.io session id of the (unique) playback client. Once
@@ -164,26 +226,57 @@ class State:
     :type sid: str
     :param client: The config for the playback client
     :type client: Client
-    :param last_seen: Timestamp of the last connected client. Used to determine
-        if a room is still in use.
-    :type last_seen: datetime
+    :param room: The name of the room, that broadcasts of this state are
+        sent to.
+    :type room: str
+    :ivar last_seen: Monotonic timestamp (see :py:func:`time.monotonic`) of
+        the last connected client. Used to determine if a room is still in use.
+    :vartype last_seen: float
+    :ivar broadcast_pending: True, if a broadcast of this state is scheduled,
+        but was not yet sent.
+    :vartype broadcast_pending: bool
     """
 
+    __slots__ = (
+        "queue",
+        "waiting_room",
+        "recent",
+        "sid",
+        "client",
+        "room",
+        "last_seen",
+        "broadcast_pending",
+    )
+
     queue: Queue
-    waiting_room: list[Entry]
+    waiting_room: dict[str, Entry]
     recent: list[Entry]
     sid: str
     client: Client
-    last_seen: datetime.datetime = field(init=False, default_factory=datetime.datetime.now)
+    room: str
+
+    def __post_init__(self) -> None:
+        # Not declared as fields, since a default would conflict with __slots__
+        self.last_seen = time.monotonic()
+        self.broadcast_pending = False
 
 
 class Server:
-    def __init__(self) -> None:
+    def __init__(self, debug: bool = False) -> None:
         self.sio = socketio.AsyncServer(
-            cors_allowed_origins="*", logger=True, engineio_logger=False, json=jsonencoder
+            cors_allowed_origins="*", logger=debug, engineio_logger=False, json=jsonencoder
         )
         self.app = web.Application()
         self.clients: dict[str, State] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._registration_keys: frozenset[str] = frozenset()
+        self._registration_keys_mtime: Optional[int] = None
+        self._broadcast_tasks: set[asyncio.Task[None]] = set()
+        self._search_tasks: dict[str, set[asyncio.Task[None]]] = {}
+        self.rooms_by_sid: dict[str, str] = {}
+        self.admins: set[str] = set()
+        self._static_files: dict[str, tuple[bytes, str]] = {}
+        self.app["search_timeout"] = DEFAULT_SEARCH_TIMEOUT
         self.sio.attach(self.app)
         self.register_handlers()
 
@@ -220,18 +313,79 @@ class Server:
         otherwise the index.html. This way the javascript can read the room code
         from the url.
 
+        Both files are read once and served from memory afterwards. Requests
+        with a matching ``If-None-Match`` header are answered with 304.
+
         :param request Any: Webrequest from aiohttp
         :return: Either the favicon or the index.html
-        :rtype web.FileResponse:
+        :rtype web.Response:
         """
         if request.path.endswith("/favicon.ico"):
-            return web.FileResponse(os.path.join(self.app["root_folder"], "favicon.ico"))
-        return web.FileResponse(os.path.join(self.app["root_folder"], "index.html"))
+            filename, content_type = "favicon.ico", "image/x-icon"
+        else:
+            filename, content_type = "index.html", "text/html"
+
+        try:
+            body, etag = self.load_static_file(filename)
+        except FileNotFoundError as exc:
+            raise web.HTTPNotFound() from exc
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type=content_type, headers=headers)
+
+    def load_static_file(self, filename: str) -> tuple[bytes, str]:
+        """
+        Return the content and ETag of a file in the root folder.
+
+        The file is read on the first call and cached afterwards.
+
+        :param filename: The name of the file in the root folder
+        :type filename: str
+        :return: The content of the file and its ETag
+        :rtype: tuple[bytes, str]
+        """
+        if filename not in self._static_files:
+            with open(os.path.join(self.app["root_folder"], filename), "rb") as f:
+                body = f.read()
+            self._static_files[filename] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        return self._static_files[filename]
 
     async def broadcast_state(self, state: State) -> None:
-        async with self.sio.session(state.sid) as session:
-            room = session["room"]
-        await self.send_state(state, room)
+        """
+        Schedule sending the current state to the whole room.
+
+        The state is sent in a separate task, once the current handler yields
+        to the event loop. All broadcasts requested until then are coalesced
+        into a single "state" message.
+
+        :param state: The state to send
+        :type state: State
+        :rtype: None
+        """
+        if state.broadcast_pending:
+            return
+        state.broadcast_pending = True
+        task = asyncio.create_task(self.flush_state(state))
+        self._broadcast_tasks.add(task)
+        task.add_done_callback(self._broadcast_tasks.discard)
+
+    async def flush_state(self, state: State) -> None:
+        """
+        Send a scheduled broadcast of the state now, if there is one.
+
+        This is called by the scheduled task, and by handlers, that need the
+        room to receive the new state before their next message.
+
+        :param state: The state to send
+        :type state: State
+        :rtype: None
+        """
+        if not state.broadcast_pending:
+            return
+        state.broadcast_pending = False
+        await self.send_state(state, state.room)
 
     async def send_state(self, state: State, sid: str) -> None:
         """
@@ -257,7 +411,7 @@ class Server:
             {
                 "queue": state.queue,
                 "recent": state.recent,
-                "waiting_room": state.waiting_room,
+                "waiting_room": list(state.waiting_room.values()),
                 "config": safe_config,
             },
             room=sid,
@@ -296,7 +450,10 @@ class Server:
         :type data: dict[str, Any]
         :rtype: None
         """
-        source_obj = state.client.sources[data["source"]]
+        source_obj = state.client.sources.get(data["source"])
+        if source_obj is None:
+            await self.sio.emit("msg", {"msg": f"Unknown source: {data['source']}"}, room=sid)
+            return
         entry = await source_obj.get_entry(
             data["performer"], data["ident"], artist=data["artist"], title=data["title"]
         )
@@ -311,14 +468,14 @@ class Server:
 
         if "uid" not in data or (
             (data["uid"] is not None and len(list(state.queue.find_by_uid(data["uid"]))) == 0)
-            or (data["uid"] is None and state.queue.find_by_name(data["performer"]) is None)
+            or (data["uid"] is None and not state.queue.has_performer(data["performer"]))
         ):
             await self.append_to_queue(state, entry, sid)
             return
 
         entry.uid = data["uid"]
 
-        state.waiting_room.append(entry)
+        state.waiting_room[str(entry.uuid)] = entry
         await self.broadcast_state(state)
         await self.sio.emit(
             "get-meta-info",
@@ -327,7 +484,12 @@ class Server:
         )
 
     async def append_to_queue(
-        self, state: State, entry: Entry, report_to: Optional[str] = None
+        self,
+        state: State,
+        entry: Entry,
+        report_to: Optional[str] = None,
+        *,
+        broadcast: bool = True,
     ) -> None:
         """
         Append a song to the queue for a given session.
@@ -341,17 +503,19 @@ class Server:
         :type entry: Entry
         :param report_to: If an error occurs, who to report to.
         :type report_to: Optional[str]
+        :param broadcast: If the new state should be send to the room. Set this
+            to False, if the caller broadcasts the state itself afterwards.
+        :type broadcast: bool
         :rtype: None
         """
         first_song = state.queue.try_peek()
         if first_song is None or first_song.started_at is None:
-            start_time = datetime.datetime.now().timestamp()
+            start_time = time.time()
         else:
             start_time = first_song.started_at
 
-        start_time = state.queue.fold(
-            lambda item, time: time + item.duration + state.client.config["preview_duration"] + 1,
-            start_time,
+        start_time += state.queue.total_duration + len(state.queue) * (
+            state.client.config["preview_duration"] + 1
         )
 
         if state.client.config["last_song"]:
@@ -368,7 +532,8 @@ class Server:
                 return
 
         state.queue.append(entry)
-        await self.broadcast_state(state)
+        if broadcast:
+            await self.broadcast_state(state)
 
         await self.sio.emit(
             "get-meta-info",
@@ -376,8 +541,8 @@ class Server:
             room=state.sid,
         )
 
-    @admin
     @with_state
+    @admin
     async def handle_show_config(self, state: State, sid: str) -> None:
         """
         Sends public config to webclient.
@@ -394,8 +559,8 @@ class Server:
             sid,
         )
 
-    @admin
     @with_state
+    @admin
     async def handle_update_config(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Forwards an updated config from an authorized webclient to the playback client.
@@ -490,7 +655,10 @@ class Server:
                 )
                 return
 
-        source_obj = state.client.sources[data["source"]]
+        source_obj = state.client.sources.get(data["source"])
+        if source_obj is None:
+            await self.sio.emit("msg", {"msg": f"Unknown source: {data['source']}"}, room=sid)
+            return
 
         entry = await source_obj.get_entry(
             data["performer"],
@@ -507,7 +675,7 @@ class Server:
             )
             return
 
-        entry.uid = data["uid"] if "uid" in data else None
+        entry.uid = data.get("uid")
 
         await self.append_to_queue(state, entry, sid)
 
@@ -537,7 +705,10 @@ class Server:
             )
             return
 
-        source_obj = state.client.sources[data["source"]]
+        source_obj = state.client.sources.get(data["source"])
+        if source_obj is None:
+            await self.sio.emit("msg", {"msg": f"Unknown source: {data['source']}"}, room=sid)
+            return
 
         entry = await source_obj.get_entry(
             data["performer"], data["ident"], artist=data["artist"], title=data["title"]
@@ -551,12 +722,12 @@ class Server:
             )
             return
 
-        entry.uid = data["uid"] if "uid" in data else None
+        entry.uid = data.get("uid")
 
         await self.append_to_queue(state, entry, sid)
 
-    @playback
     @with_state
+    @playback
     async def handle_meta_info(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "meta-info" message.
@@ -579,14 +750,14 @@ class Server:
             lambda item: item.update(**data["meta"], incomplete_data=False),
         )
 
-        for entry in state.waiting_room:
-            if entry.uuid == data["uuid"] or str(entry.uuid) == data["uuid"]:
-                entry.update(**data["meta"], incomplete_data=False)
+        wr_entry = state.waiting_room.get(data["uuid"])
+        if wr_entry is not None:
+            wr_entry.update(**data["meta"], incomplete_data=False)
 
         await self.broadcast_state(state)
 
-    @playback
     @with_state
+    @playback
     async def handle_get_first(self, state: State, sid: str) -> None:
         """
         Handle the "get-first" message.
@@ -606,12 +777,12 @@ class Server:
         :rtype: None
         """
         current = await state.queue.peek()
-        current.started_at = datetime.datetime.now().timestamp()
+        current.started_at = time.time()
 
         await self.sio.emit("play", current, room=sid)
 
-    @admin
     @with_state
+    @admin
     async def handle_waiting_room_to_queue(
         self, state: State, sid: str, data: dict[str, Any]
     ) -> None:
@@ -625,12 +796,8 @@ class Server:
         :type sid: str
         :rtype: None
         """
-        entry = next(
-            (wr_entry for wr_entry in state.waiting_room if str(wr_entry.uuid) == data["uuid"]),
-            None,
-        )
+        entry = state.waiting_room.pop(data["uuid"], None)
         if entry is not None:
-            state.waiting_room.remove(entry)
             await self.append_to_queue(state, entry, sid)
 
     async def add_songs_from_waiting_room(self, state: State) -> None:
@@ -639,20 +806,17 @@ class Server:
 
         A song should be added if none of its performers are already queued.
 
-        This should be called every time a song leaves the queue.
+        This should be called every time a song leaves the queue. The new state
+        is not broadcasted, the caller is responsible for that.
 
         :param room: The room holding the queue.
         :type room: str
         :rtype: None
         """
-        wrs_to_remove = []
-        for wr_entry in state.waiting_room:
-            if state.queue.find_by_name(wr_entry.performer) is None:
-                await self.append_to_queue(state, wr_entry)
-                wrs_to_remove.append(wr_entry)
-
-        for wr_entry in wrs_to_remove:
-            state.waiting_room.remove(wr_entry)
+        for wr_uuid, wr_entry in list(state.waiting_room.items()):
+            if not state.queue.has_performer(wr_entry.performer):
+                await self.append_to_queue(state, wr_entry, broadcast=False)
+                del state.waiting_room[wr_uuid]
 
     async def discard_first(self, state: State) -> Entry:
         """
@@ -672,12 +836,12 @@ class Server:
         await self.add_songs_from_waiting_room(state)
 
         state.recent.append(old_entry)
-        state.last_seen = datetime.datetime.now()
+        state.last_seen = time.monotonic()
 
         return old_entry
 
-    @playback
     @with_state
+    @playback
     async def handle_pop_then_get_next(self, state: State, sid: str) -> None:
         """
         Handle the "pop-then-get-next" message.
@@ -697,11 +861,14 @@ class Server:
         :rtype: None
         """
         await self.discard_first(state)
-        await self.broadcast_state(state)
+        if not state.queue:
+            # Waiting for the next entry may take a while, show the pop now
+            await self.broadcast_state(state)
 
         current = await state.queue.peek()
-        current.started_at = datetime.datetime.now().timestamp()
+        current.started_at = time.time()
         await self.broadcast_state(state)
+        await self.flush_state(state)
 
         await self.sio.emit("play", current, room=sid)
 
@@ -712,16 +879,22 @@ class Server:
         This is used to authenticate a client, if the server is in private or
         restricted mode.
 
+        The keys are kept in memory and the keyfile is only read again, if its
+        modification time changed.
+
         :param key: The key to check
         :type key: str
         :return: True if the key is in the registration keyfile, False otherwise
         :rtype: bool
         """
-        with open(self.app["registration-keyfile"], encoding="utf8") as f:
-            raw_keys = f.readlines()
-            keys = [key[:64] for key in raw_keys]
+        keyfile = self.app["registration-keyfile"]
+        mtime = os.stat(keyfile).st_mtime_ns
+        if mtime != self._registration_keys_mtime:
+            with open(keyfile, encoding="utf8") as f:
+                self._registration_keys = frozenset(line[:64] for line in f)
+            self._registration_keys_mtime = mtime
 
-            return key in keys
+        return key in self._registration_keys
 
     async def handle_register_client(self, sid: str, data: dict[str, Any]) -> None:
         """
@@ -769,10 +942,12 @@ class Server:
         """
 
         def gen_id(length: int = 4) -> str:
-            client_id = "".join([random.choice(string.ascii_letters) for _ in range(length)])
-            if client_id in self.clients:
-                client_id = gen_id(length + 1)
-            return client_id
+            while True:
+                for _ in range(8):
+                    client_id = "".join(random.choices(string.ascii_letters, k=length))
+                    if client_id not in self.clients:
+                        return client_id
+                length += 1
 
         if "key" in data["config"]:
             data["config"]["key"] = hashlib.sha256(data["config"]["key"].encode()).hexdigest()
@@ -787,17 +962,12 @@ class Server:
             )
             return
 
-        room: str = (
-            data["config"]["room"]
-            if "room" in data["config"] and data["config"]["room"]
-            else gen_id()
-        )
-        async with self.sio.session(sid) as session:
-            session["room"] = room
+        room: str = data["config"].get("room") or gen_id()
+        self.rooms_by_sid[sid] = room
 
         if room in self.clients:
             old_state: State = self.clients[room]
-            if data["config"]["secret"] == old_state.client.config["secret"]:
+            if _secret_matches(data["config"]["secret"], old_state.client.config["secret"]):
                 logger.info("Got new client connection for %s", room)
                 old_state.sid = sid
                 old_state.client = Client(
@@ -813,28 +983,30 @@ class Server:
                 await self.sio.emit("client-registered", {"success": False, "room": room}, room=sid)
         else:
             logger.info("Registerd new client %s", room)
-            initial_entries = [Entry(**entry) for entry in data["queue"]]
-            initial_waiting_room = [Entry(**entry) for entry in data["waiting_room"]]
-            initial_recent = [Entry(**entry) for entry in data["recent"]]
+            initial_entries = Entry.from_dicts(data["queue"])
+            initial_waiting_room = Entry.from_dicts(data["waiting_room"])
+            initial_recent = Entry.from_dicts(data["recent"])
 
             self.clients[room] = State(
                 queue=Queue(initial_entries),
-                waiting_room=initial_waiting_room,
+                waiting_room={str(entry.uuid): entry for entry in initial_waiting_room},
                 recent=initial_recent,
                 sid=sid,
                 client=Client(
                     sources={},
-                    sources_prio=[],
+                    sources_prio=(),
                     config=DEFAULT_CONFIG | data["config"],
                 ),
+                room=room,
             )
+            heapq.heappush(self._expiry_heap, (self.clients[room].last_seen, room))
 
             await self.sio.enter_room(sid, room)
             await self.sio.emit("client-registered", {"success": True, "room": room}, room=sid)
             await self.send_state(self.clients[room], sid)
 
-    @playback
     @with_state
+    @playback
     async def handle_sources(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "sources" message.
@@ -856,19 +1028,23 @@ class Server:
         :type data: dict[str, Any]
         :rtype: None
         """
-        unused_sources = state.client.sources.keys() - data["sources"]
-        new_sources = data["sources"] - state.client.sources.keys()
+        sources_prio = tuple(data["sources"])
+        used_sources = frozenset(sources_prio)
+        new_sources = [name for name in sources_prio if name not in state.client.sources]
 
-        for source in unused_sources:
-            del state.client.sources[source]
+        state.client.sources = {
+            name: source for name, source in state.client.sources.items() if name in used_sources
+        }
 
-        state.client.sources_prio = data["sources"]
+        state.client.sources_prio = sources_prio
+        state.client.update_prio_sources()
 
-        for name in new_sources:
-            await self.sio.emit("request-config", {"source": name}, room=sid)
+        await asyncio.gather(
+            *(self.sio.emit("request-config", {"source": name}, room=sid) for name in new_sources)
+        )
 
-    @playback
     @with_state
+    @playback
     async def handle_config_chunk(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "config-chunk" message.
@@ -887,12 +1063,17 @@ class Server:
         :rtype: None
         """
         if data["source"] not in state.client.sources:
-            state.client.sources[data["source"]] = available_sources[data["source"]](data["config"])
+            source_class = available_sources.get(data["source"])
+            if source_class is None:
+                logger.warning("Got config for unknown source %s", data["source"])
+                return
+            state.client.sources[data["source"]] = source_class(data["config"])
+            state.client.update_prio_sources()
         else:
             state.client.sources[data["source"]].add_to_config(data["config"], data["number"])
 
-    @playback
     @with_state
+    @playback
     async def handle_config(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "config" message.
@@ -909,7 +1090,12 @@ class Server:
         :type data: dict[str, Any]
         :rtype: None
         """
-        state.client.sources[data["source"]] = available_sources[data["source"]](data["config"])
+        source_class = available_sources.get(data["source"])
+        if source_class is None:
+            logger.warning("Got config for unknown source %s", data["source"])
+            return
+        state.client.sources[data["source"]] = source_class(data["config"])
+        state.client.update_prio_sources()
 
     async def handle_register_web(self, sid: str, data: dict[str, Any]) -> bool:
         """
@@ -926,10 +1112,9 @@ class Server:
         :rtype: bool
         """
         if data["room"] in self.clients:
-            async with self.sio.session(sid) as session:
-                session["room"] = data["room"]
-                await self.sio.enter_room(sid, session["room"])
-            state = self.clients[session["room"]]
+            self.rooms_by_sid[sid] = data["room"]
+            await self.sio.enter_room(sid, data["room"])
+            state = self.clients[data["room"]]
             await self.send_state(state, sid)
             return True
         return False
@@ -949,13 +1134,15 @@ class Server:
         :returns: True, if the secret is correct, False otherwise
         :rtype: bool
         """
-        is_admin: bool = data["secret"] == state.client.config["secret"]
-        async with self.sio.session(sid) as session:
-            session["admin"] = is_admin
+        is_admin: bool = _secret_matches(data["secret"], state.client.config["secret"])
+        if is_admin:
+            self.admins.add(sid)
+        else:
+            self.admins.discard(sid)
         return is_admin
 
-    @admin
     @with_state
+    @admin
     async def handle_skip_current(self, state: State, sid: str) -> None:
         """
         Handle a "skip-current" message.
@@ -969,11 +1156,12 @@ class Server:
         :rtype: None
         """
         old_entry = await self.discard_first(state)
-        await self.sio.emit("skip-current", old_entry, room=state.sid)
         await self.broadcast_state(state)
+        await self.flush_state(state)
+        await self.sio.emit("skip-current", old_entry, room=state.sid)
 
-    @admin
     @with_state
+    @admin
     async def handle_move_to(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "move-to" message.
@@ -990,8 +1178,8 @@ class Server:
         await state.queue.move_to(data["uuid"], data["target"])
         await self.broadcast_state(state)
 
-    @admin
     @with_state
+    @admin
     async def handle_move_up(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "move-up" message.
@@ -1008,8 +1196,8 @@ class Server:
         await state.queue.move_up(data["uuid"])
         await self.broadcast_state(state)
 
-    @admin
     @with_state
+    @admin
     async def handle_skip(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "skip" message.
@@ -1027,22 +1215,14 @@ class Server:
         if entry is not None:
             logger.info("Skipping %s", entry)
 
-            await self.add_songs_from_waiting_room(state)
-
             await state.queue.remove(entry)
 
-        first_entry_index = None
-        for idx, wr_entry in enumerate(state.waiting_room):
-            if wr_entry.uuid == data["uuid"]:
-                first_entry_index = idx
-                break
-
-        if first_entry_index is not None:
-            logger.info(
-                "Deleting %s from waiting room",
-                state.waiting_room[first_entry_index],
-            )
-            del state.waiting_room[first_entry_index]
+            await self.add_songs_from_waiting_room(state)
+        else:
+            wr_entry = state.waiting_room.pop(data["uuid"], None)
+            if wr_entry is None:
+                return
+            logger.info("Deleting %s from waiting room", wr_entry)
         await self.broadcast_state(state)
 
     async def handle_disconnect(self, sid: str) -> None:
@@ -1051,14 +1231,17 @@ class Server:
 
         This message is send automatically, when a client disconnets.
 
-        Remove the client from its room.
+        Remove the client from its room and forget its room and admin status.
+        Searches, that are still running for the client, are cancelled.
 
         :param sid: The session id of the client disconnecting
         :type sid: str
         :rtype: None
         """
-        async with self.sio.session(sid) as session:
-            room = session.get("room")
+        self.admins.discard(sid)
+        for task in self._search_tasks.pop(sid, ()):
+            task.cancel()
+        room = self.rooms_by_sid.pop(sid, None)
         if room is not None:
             await self.sio.leave_room(sid, room)
 
@@ -1072,7 +1255,14 @@ class Server:
         :py:attr:`Config.sources_prio` attribute of the state.
 
         The result will be send with a "search-results" message to the (web)
-        client.
+        client. Every time a source finishes, all results gathered so far are
+        sent, so the fastest source does not have to wait for the slowest one.
+        The last message contains the complete results.
+
+        A source, that fails or does not answer within the configured search
+        timeout (``--search-timeout``, ``DEFAULT_SEARCH_TIMEOUT`` seconds by
+        default), is logged and contributes no results. If the client
+        disconnects, the remaining searches are cancelled.
 
         :param sid: The session id of the client requesting.
         :type sid: str
@@ -1086,22 +1276,55 @@ class Server:
             or "key" in state.client.config
             and self.check_registration(state.client.config["key"])
         ):
-            results_list = await asyncio.gather(
-                *[
-                    state.client.sources[source].search(query)
-                    for source in state.client.sources_prio
-                ]
-            )
+            sources = state.client.prio_sources
+            results_list: list[Optional[list[Result]]] = [None] * len(sources)
+
+            timeout = self.app["search_timeout"]
+
+            async def search(idx: int, source: Source) -> None:
+                try:
+                    results_list[idx] = await asyncio.wait_for(source.search(query), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "Search in %s timed out after %s seconds for %s",
+                        source.source_name,
+                        timeout,
+                        query,
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    logger.warning(
+                        "Search in %s failed for %s", source.source_name, query, exc_info=True
+                    )
 
-            results = [
-                search_result for source_result in results_list for search_result in source_result
-            ]
-            await self.send_search_results(sid, results)
+            tasks = {asyncio.create_task(search(idx, source)) for idx, source in enumerate(sources)}
+            self._search_tasks.setdefault(sid, set()).update(tasks)
+            pending = tasks
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    if any(task.cancelled() for task in done):
+                        return
+                    results = [
+                        search_result
+                        for source_result in results_list
+                        if source_result is not None
+                        for search_result in source_result
+                    ]
+                    await self.send_search_results(sid, results)
+            finally:
+                for task in pending:
+                    task.cancel()
+                running = self._search_tasks.get(sid)
+                if running is not None:
+                    running.difference_update(tasks)
+                    if not running:
+                        del self._search_tasks[sid]
         else:
             await self.sio.emit("search", {"query": query, "sid": sid}, room=state.sid)
 
+    @with_state
     @playback
-    async def handle_search_results(self, sid: str, data: dict[str, Any]) -> None:
+    async def handle_search_results(self, state: State, sid: str, data: dict[str, Any]) -> None:
         """
         Handle the "search-results" message.
 
@@ -1145,33 +1368,43 @@ class Server:
 
         This runs every hour, and removes every client, that did not requested a song for four hours.
 
+        Rooms are kept in a heap ordered by the ``last_seen`` value they had,
+        when they were pushed. ``last_seen`` is not tracked on every update,
+        so a popped room, that was seen in the meantime, is pushed again with
+        its current value.
+
         :rtype: None
         """
 
         logger.info("Start Cleanup")
         to_remove: list[str] = []
-        for sid, state in self.clients.items():
-            logger.info("Client %s, last seen: %s", sid, str(state.last_seen))
-            if state.last_seen + datetime.timedelta(hours=4) < datetime.datetime.now():
-                logger.info("No activity for 4 hours, removing %s", sid)
-                to_remove.append(sid)
-        for sid in to_remove:
-            await self.sio.disconnect(sid)
-            del self.clients[sid]
+        now = time.monotonic()
+        cutoff = now - 4 * 3600
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+            _, room = heapq.heappop(self._expiry_heap)
+            state = self.clients[room]
+            logger.info(
+                "Client %s, last seen: %s ago",
+                room,
+                str(datetime.timedelta(seconds=int(now - state.last_seen))),
+            )
+            if state.last_seen < cutoff:
+                logger.info("No activity for 4 hours, removing %s", room)
+                to_remove.append(room)
+            else:
+                heapq.heappush(self._expiry_heap, (state.last_seen, room))
+        participants = [
+            sid for room in to_remove for sid, _ in self.sio.manager.get_participants("/", room)
+        ]
+        await asyncio.gather(*(self.sio.disconnect(sid) for sid in participants))
+        for room in to_remove:
+            del self.clients[room]
         logger.info("End Cleanup")
 
-        # The internal loop counter does not use a regular timestamp, so we need to convert between
-        # regular datetime and the async loop time
-        now = datetime.datetime.now()
-        # today = datetime.datetime(now.year, now.month, now.day)
-        # next_run = today + datetime.timedelta(days=1)
-
-        next_run = now + datetime.timedelta(hours=1)
-        offset = next_run.timestamp() - now.timestamp()
-        loop_next = asyncio.get_event_loop().time() + offset
-
-        logger.info("Next Cleanup at %s", str(next))
-        asyncio.get_event_loop().call_at(loop_next, lambda: asyncio.create_task(self.cleanup()))
+        next_run = datetime.datetime.now() + datetime.timedelta(hours=1)
+        logger.info("Next Cleanup at %s", str(next_run))
+        loop = asyncio.get_running_loop()
+        loop.call_later(3600, lambda: loop.create_task(self.cleanup()))
 
     async def background_tasks(
         self,
@@ -1205,6 +1438,8 @@ class Server:
             - `registration_keyfile`, the file containing the registration keys
             - `private`, if the server is private
             - `restricted`, if the server is restricted
+            - `search_timeout`, the time in seconds to wait for a source to
+              answer a search
 
         :param args: The command line arguments
         :type args: Namespace
@@ -1217,6 +1452,7 @@ class Server:
             self.app["registration-keyfile"] = args.registration_keyfile
 
         self.app["root_folder"] = args.root_folder
+        self.app["search_timeout"] = args.search_timeout
 
         self.app.add_routes(
             [web.static("/assets/", os.path.join(self.app["root_folder"], "assets/"))]
@@ -1237,9 +1473,24 @@ def run_server(args: Namespace) -> None:
     """
     Run the server.
 
+    If ``args.debug`` is set, socket.io logs every packet.
+
+    The event loop is selected with ``args.loop``: ``uvloop`` uses uvloop,
+    ``asyncio`` the default event loop and ``auto`` uses uvloop, if it is
+    installed.
+
     :param args: The command line arguments
     :type args: Namespace
     :rtype: None
     """
-    server = Server()
+    loop = args.loop
+    if loop == "auto":
+        loop = "uvloop" if UVLOOP_AVAILABLE else "asyncio"
+    if loop == "uvloop":
+        if UVLOOP_AVAILABLE:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        else:
+            logger.warning("uvloop is not installed, using the default event loop")
+
+    server = Server(debug=args.debug)
     server.run(args)
@@ -40,6 +40,14 @@ class FileBasedSource(Source):
 
         self.extensions: list[str] = config["extensions"] if "extensions" in config else ["mp3+cdg"]
         self.extra_mpv_options = {"scale": "oversample"}
+        self._valid_extensions: frozenset[str] = frozenset(
+            ext.rsplit("+", maxsplit=1)[-1] for ext in self.extensions
+        )
+        self._split_extensions: dict[str, str] = {
+            video: audio
+            for [audio, video] in (ext.split("+") for ext in self.extensions if "+" in ext)
+        }
+        self._durations: dict[tuple[str, int, int], int] = {}
 
     def has_correct_extension(self, path: Optional[str]) -> bool:
         """
@@ -52,9 +60,7 @@ class FileBasedSource(Source):
         :return: True iff path has correct extension.
         :rtype: bool
         """
-        return path is not None and os.path.splitext(path)[1][1:] in [
-            ext.rsplit("+", maxsplit=1)[-1] for ext in self.extensions
-        ]
+        return path is not None and os.path.splitext(path)[1][1:] in self._valid_extensions
 
     def get_video_audio_split(self, path: str) -> tuple[str, Optional[str]]:
         """
@@ -67,14 +73,11 @@ class FileBasedSource(Source):
         :return: Tuple with path to video and audio file
         :rtype: tuple[str, Optional[str]]
         """
-        extension_of_path = os.path.splitext(path)[1][1:]
-        splitted_extensions = [ext.split("+") for ext in self.extensions if "+" in ext]
-        splitted_extensions_dict = {video: audio for [audio, video] in splitted_extensions}
-
-        if extension_of_path in splitted_extensions_dict:
-            audio_path = (
-                os.path.splitext(path)[0] + "." + splitted_extensions_dict[extension_of_path]
-            )
+        base, extension = os.path.splitext(path)
+        extension_of_path = extension[1:]
+
+        if extension_of_path in self._split_extensions:
+            audio_path = base + "." + self._split_extensions[extension_of_path]
             return (path, audio_path)
         return (path, None)
 
@@ -82,6 +85,9 @@ class FileBasedSource(Source):
         """
         Return the duration for the file.
 
+        Durations are cached by path, modification time and size of the
+        file, so a song, that is requested again, is not parsed again.
+
         :param path: The path to the file
         :type path: str
         :return: The duration in seconds
@@ -91,11 +97,16 @@ class FileBasedSource(Source):
             return 180
 
         def _get_duration(file: str) -> int:
+            stat = os.stat(file)
+            key = (file, stat.st_mtime_ns, stat.st_size)
+            if key in self._durations:
+                return self._durations[key]
             info: str | MediaInfo = MediaInfo.parse(file)
             if isinstance(info, str):
                 return 180
-            duration: int = info.audio_tracks[0].to_data()["duration"]
-            return duration // 1000
+            duration: int = info.audio_tracks[0].to_data()["duration"] // 1000
+            self._durations[key] = duration
+            return duration
 
         video_path, audio_path = self.get_video_audio_split(path)
 
@@ -0,0 +1,70 @@
+"""Tests for :py:class:`syng.entry.Entry`."""
+
+from dataclasses import asdict
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from syng.entry import Entry
+
+
+def make_entry(**kwargs: Any) -> Entry:
+    return Entry(
+        ident="ident",
+        source="files",
+        duration=100,
+        title="Title",
+        artist="Artist",
+        album="Album",
+        performer="Alice",
+        **kwargs,
+    )
+
+
+def test_to_dict_matches_asdict() -> None:
+    entry = make_entry(uid="uid")
+    assert entry.to_dict() == asdict(entry)
+
+
+def test_to_dict_reflects_changes_and_ignores_extra_attributes() -> None:
+    entry = make_entry()
+    first = entry.to_dict()
+
+    entry.duration = 50
+    entry.update(title="Other", not_a_field=1)
+    second = entry.to_dict()
+
+    assert first["duration"] == 100 and first["title"] == "Title"
+    assert second["duration"] == 50 and second["title"] == "Other"
+    assert "not_a_field" not in second
+    assert second is not entry.to_dict()
+
+
+def test_from_dicts_with_all_fields_round_trips() -> None:
+    entries = [make_entry(uid="uid"), make_entry(started_at=1.0)]
+
+    restored = Entry.from_dicts(entry.to_dict() for entry in entries)
+
+    assert restored == entries
+    assert all(type(entry) is Entry for entry in restored)
+    assert restored[0] is not entries[0]
+
+
+def test_from_dicts_applies_defaults_to_partial_rows() -> None:
+    row = make_entry().to_dict()
+    del row["uuid"], row["uid"], row["started_at"]
+
+    (entry,) = Entry.from_dicts([row])
+
+    assert isinstance(entry.uuid, UUID)
+    assert entry.uid is None and entry.started_at is None
+    assert entry.performer == "Alice"
+
+
+def test_from_dicts_rejects_unknown_keys() -> None:
+    row = make_entry().to_dict()
+    row["not_a_field"] = 1
+
+    with pytest.raises(TypeError):
+        Entry.from_dicts([row])
@@ -0,0 +1,63 @@
+"""Tests for :py:mod:`syng.jsonencoder`."""
+
+import json
+from typing import Any
+
+import pytest
+
+from syng import jsonencoder
+from syng.entry import Entry
+from syng.queue import Queue
+from syng.result import Result
+
+
+def make_entry(**kwargs: Any) -> Entry:
+    return Entry(
+        ident="ident",
+        source="files",
+        duration=100,
+        title="Title",
+        artist="Artist",
+        album="Album",
+        performer="Alice",
+        **kwargs,
+    )
+
+
+def payload() -> dict[Any, Any]:
+    entry = make_entry()
+    entry.update(incomplete_data=False, not_a_field=1)
+    return {
+        "queue": Queue([entry, make_entry()]),
+        "recent": [make_entry()],
+        "result": Result(ident="i", source="files", title="T", artist="A", album="B"),
+        "uuid": entry.uuid,
+        1: "numeric key",
+    }
+
+
+@pytest.fixture(params=[False, True], ids=["json", "orjson"])
+def use_orjson(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    if request.param and not jsonencoder.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(jsonencoder, "ORJSON_AVAILABLE", request.param)
+    return bool(request.param)
+
+
+def test_entries_are_encoded_by_their_fields_only(use_orjson: bool) -> None:
+    data = jsonencoder.loads(jsonencoder.dumps(payload()))
+
+    assert [entry.keys() for entry in data["queue"]] == [Entry.__dataclass_fields__.keys()] * 2
+    assert "not_a_field" not in data["queue"][0]
+    assert Entry.from_dicts(data["queue"] + data["recent"])
+    assert data["uuid"] == data["queue"][0]["uuid"]
+    assert data["1"] == "numeric key"
+
+
+def test_both_encoders_produce_the_same_payload() -> None:
+    if not jsonencoder.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    data = payload()
+    assert json.loads(jsonencoder.dumps(data)) == json.loads(
+        json.dumps(data, cls=jsonencoder.SyngEncoder)
+    )
@@ -0,0 +1,257 @@
+"""Tests for :py:class:`syng.queue.Queue`."""
+
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from syng.entry import Entry, normalize_performers
+from syng.queue import Queue
+
+
+def make_entry(performer: str = "Alice", duration: int = 100, **kwargs: Any) -> Entry:
+    return Entry(
+        ident=kwargs.pop("ident", str(uuid4())),
+        source="files",
+        duration=duration,
+        title="Title",
+        artist="Artist",
+        album="Album",
+        performer=performer,
+        **kwargs,
+    )
+
+
+def assert_consistent(queue: Queue) -> None:
+    """Check every index of the queue against the entries in the deque."""
+    entries = list(queue)
+
+    by_uuid = {str(entry.uuid): entry for entry in entries}
+    assert len(by_uuid) == len(entries)
+    assert queue._by_uuid == by_uuid
+    for key, entry in queue._by_uuid.items():
+        assert by_uuid[key] is entry
+
+    by_performer: dict[str, list[int]] = {}
+    for entry in entries:
+        for name in normalize_performers(entry.performer):
+            by_performer.setdefault(name, []).append(id(entry))
+    assert {name: sorted(map(id, indexed)) for name, indexed in queue._by_performer.items()} == {
+        name: sorted(ids) for name, ids in by_performer.items()
+    }
+
+    assert queue.total_duration == sum(entry.duration for entry in entries)
+    assert len(queue) == len(entries)
+    assert queue.nonempty.is_set() == bool(entries)
+
+
+def test_append_and_popleft_keep_indices() -> None:
+    async def run() -> None:
+        first, second = make_entry("Alice"), make_entry("Bob und Carol")
+        queue = Queue([first])
+        queue.append(second)
+        assert_consistent(queue)
+
+        assert await queue.popleft() is first
+        assert_consistent(queue)
+        assert queue.find_by_uuid(first.uuid) is None
+        assert queue.find_by_uuid(str(second.uuid)) is second
+
+        assert await queue.popleft() is second
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_popleft_waits_for_append() -> None:
+    async def run() -> None:
+        queue = Queue([])
+        task = asyncio.create_task(queue.popleft())
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        entry = make_entry()
+        queue.append(entry)
+        assert await asyncio.wait_for(task, 1) is entry
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_remove() -> None:
+    async def run() -> None:
+        entries = [make_entry(name) for name in ("Alice", "Bob", "Carol", "Dave")]
+        queue = Queue(entries)
+
+        await queue.remove(entries[2])
+        assert list(queue) == [entries[0], entries[1], entries[3]]
+        assert_consistent(queue)
+
+        await queue.remove(entries[3])
+        await queue.remove(entries[0])
+        assert list(queue) == [entries[1]]
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_remove_unknown_entry_is_a_noop() -> None:
+    async def run() -> None:
+        entry = make_entry()
+        queue = Queue([entry])
+
+        await queue.remove(make_entry())
+        # Equal in every field, but a different object
+        twin = make_entry(ident=entry.ident, uuid=entry.uuid)
+        await queue.remove(twin)
+
+        assert list(queue) == [entry]
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_update_reindexes_entry() -> None:
+    entry = make_entry("Alice", duration=100)
+    queue = Queue([entry, make_entry("Bob")])
+
+    queue.update(str(entry.uuid), lambda item: item.update(performer="Carol", duration=50))
+
+    assert entry.performer == "Carol" and entry.duration == 50
+    assert not queue.has_performer("Alice")
+    assert queue.find_by_name("carol") is entry
+    assert_consistent(queue)
+
+
+def test_update_keeps_indices_if_updater_raises() -> None:
+    async def run() -> None:
+        entry = make_entry("Alice")
+        queue = Queue([entry])
+
+        def updater(item: Entry) -> None:
+            raise RuntimeError("broken metadata")
+
+        with pytest.raises(RuntimeError):
+            queue.update(entry.uuid, updater)
+        assert_consistent(queue)
+        assert await queue.popleft() is entry
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_update_unknown_uuid_is_a_noop() -> None:
+    entry = make_entry()
+    queue = Queue([entry])
+    queue.update(str(uuid4()), lambda item: item.update(duration=1))
+    assert entry.duration == 100
+    assert_consistent(queue)
+
+
+@pytest.mark.parametrize(
+    ("index", "target", "expected"),
+    [
+        (3, 1, [0, 3, 1, 2, 4]),
+        (1, 4, [0, 2, 3, 1, 4]),
+        (0, 5, [1, 2, 3, 4, 0]),
+        (4, 0, [4, 0, 1, 2, 3]),
+        (2, 2, [0, 1, 2, 3, 4]),
+    ],
+)
+def test_move_to(index: int, target: int, expected: list[int]) -> None:
+    async def run() -> None:
+        entries = [make_entry(str(i)) for i in range(5)]
+        queue = Queue(entries)
+        await queue.move_to(str(entries[index].uuid), target)
+        assert list(queue) == [entries[i] for i in expected]
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_move_up() -> None:
+    async def run() -> None:
+        entries = [make_entry(str(i)) for i in range(4)]
+        queue = Queue(entries)
+
+        await queue.move_up(str(entries[3].uuid))
+        assert list(queue) == [entries[0], entries[1], entries[3], entries[2]]
+
+        # The first two entries are never moved
+        await queue.move_up(str(entries[1].uuid))
+        assert list(queue) == [entries[0], entries[1], entries[3], entries[2]]
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_move_unknown_uuid_is_a_noop() -> None:
+    async def run() -> None:
+        entries = [make_entry(str(i)) for i in range(3)]
+        queue = Queue(entries)
+
+        await queue.move_to(str(uuid4()), 2)
+        await queue.move_up(str(uuid4()))
+
+        assert list(queue) == entries
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_duplicate_initial_uuid_gets_a_fresh_uuid() -> None:
+    async def run() -> None:
+        first = make_entry("Alice")
+        duplicate = make_entry("Bob", uuid=first.uuid)
+        queue = Queue([first, duplicate])
+
+        assert list(queue) == [first, duplicate]
+        assert duplicate.uuid != first.uuid
+        assert queue.find_by_uuid(first.uuid) is first
+        assert queue.find_by_uuid(duplicate.uuid) is duplicate
+        assert_consistent(queue)
+        assert await queue.popleft() is first
+        assert await queue.popleft() is duplicate
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_appended_duplicate_uuid_gets_a_fresh_uuid() -> None:
+    async def run() -> None:
+        first = make_entry("Alice")
+        duplicate = make_entry("Bob", uuid=str(first.uuid))
+        queue = Queue([first])
+        queue.append(duplicate)
+
+        assert str(duplicate.uuid) != str(first.uuid)
+        assert queue.find_by_uuid(first.uuid) is first
+        assert queue.find_by_uuid(duplicate.uuid) is duplicate
+        assert_consistent(queue)
+
+        # The duplicate can be moved and removed like any other entry
+        await queue.move_to(str(duplicate.uuid), 0)
+        assert list(queue) == [duplicate, first]
+        await queue.remove(duplicate)
+        assert list(queue) == [first]
+        assert_consistent(queue)
+
+    asyncio.run(run())
+
+
+def test_find_by_name_returns_first_in_queue_order() -> None:
+    async def run() -> None:
+        alice = make_entry("Alice")
+        bob = make_entry("Bob")
+        both = make_entry("Alice und Bob")
+        queue = Queue([alice, bob, both])
+
+        assert queue.find_by_name("bob") is bob
+        await queue.move_to(str(both.uuid), 0)
+        assert queue.find_by_name("Bob") is both
+        assert queue.find_by_name("Eve") is None
+        assert queue.has_performer("der Bob")
+        assert not queue.has_performer("Eve")
+
+    asyncio.run(run())
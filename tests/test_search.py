@@ -0,0 +1,144 @@
+"""Tests for the "search" handler of :py:class:`syng.server.Server`."""
+
+import asyncio
+from typing import Any, Optional
+
+import pytest
+
+pytest.importorskip("profanity_check")
+
+from syng.queue import Queue  # noqa: E402
+from syng.result import Result  # noqa: E402
+from syng.server import Client, Server, State  # noqa: E402
+
+WEB_SID = "web-sid"
+
+
+class FakeSource:
+    """A source, that answers searches after a delay, or fails."""
+
+    def __init__(self, name: str, delay: float = 0.0, error: Optional[Exception] = None) -> None:
+        self.source_name = name
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def search(self, query: str) -> list[Result]:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return [
+            Result(
+                ident=f"{query}-{self.source_name}",
+                source=self.source_name,
+                title=query,
+                artist=None,
+                album=None,
+            )
+        ]
+
+
+def setup_server(*sources: FakeSource, timeout: float = 1.0) -> tuple[Server, list[Any]]:
+    """Create a server with one room using the sources, and record its emits."""
+    server = Server()
+    server.app["type"] = "public"
+    server.app["search_timeout"] = timeout
+    state = State(
+        queue=Queue([]),
+        waiting_room={},
+        recent=[],
+        sid="playback-sid",
+        client=Client(
+            sources={source.source_name: source for source in sources},  # type: ignore[misc]
+            sources_prio=tuple(source.source_name for source in sources),
+            config={},
+        ),
+        room="ROOM",
+    )
+    server.clients["ROOM"] = state
+    server.rooms_by_sid[WEB_SID] = "ROOM"
+
+    emits: list[Any] = []
+
+    async def emit(event: str, data: Any = None, room: Optional[str] = None, **_: Any) -> None:
+        emits.append((event, data, room))
+
+    server.sio.emit = emit  # type: ignore[method-assign,assignment]
+    return server, emits
+
+
+def result_idents(emit: Any) -> list[str]:
+    event, data, room = emit
+    assert event == "search-results" and room == WEB_SID
+    return [result.ident for result in data["results"]]
+
+
+def test_failing_and_slow_sources_do_not_block_results() -> None:
+    async def run() -> None:
+        server, emits = setup_server(
+            FakeSource("slow", delay=10),
+            FakeSource("broken", error=RuntimeError("offline")),
+            FakeSource("fast"),
+            timeout=0.05,
+        )
+        await asyncio.wait_for(server.handle_search(WEB_SID, {"query": "q"}), 1)
+
+        # One message per round of finished searches, the last one is complete
+        assert 1 <= len(emits) <= 3
+        assert result_idents(emits[-1]) == ["q-fast"]
+        assert server._search_tasks == {}
+
+    asyncio.run(run())
+
+
+def test_search_timeout_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    async def run() -> None:
+        server, _ = setup_server(FakeSource("slow", delay=10), timeout=0.01)
+        await asyncio.wait_for(server.handle_search(WEB_SID, {"query": "q"}), 1)
+
+    asyncio.run(run())
+    assert "Search in slow timed out after 0.01 seconds for q" in caplog.text
+
+
+def test_disconnect_cancels_running_searches() -> None:
+    async def run() -> None:
+        slow = FakeSource("slow", delay=10)
+        server, emits = setup_server(slow, FakeSource("slower", delay=10))
+
+        async def leave_room(sid: str, room: str) -> None:
+            pass
+
+        server.sio.leave_room = leave_room  # type: ignore[method-assign]
+
+        search = asyncio.create_task(server.handle_search(WEB_SID, {"query": "q"}))
+        await asyncio.sleep(0.01)
+        assert len(server._search_tasks[WEB_SID]) == 2
+
+        await server.handle_disconnect(WEB_SID)
+        await asyncio.wait_for(search, 1)
+
+        assert slow.cancelled
+        assert emits == []
+        assert server._search_tasks == {}
+
+    asyncio.run(run())
+
+
+def test_results_are_sent_progressively_in_priority_order() -> None:
+    async def run() -> None:
+        server, emits = setup_server(
+            FakeSource("slow", delay=0.1), FakeSource("medium", delay=0.05), FakeSource("fast")
+        )
+        await asyncio.wait_for(server.handle_search(WEB_SID, {"query": "q"}), 1)
+
+        assert [result_idents(emit) for emit in emits] == [
+            ["q-fast"],
+            ["q-medium", "q-fast"],
+            ["q-slow", "q-medium", "q-fast"],
+        ]
+
+    asyncio.run(run())
@@ -0,0 +1,274 @@
+"""Tests for helpers and state broadcasting of :py:mod:`syng.server`."""
+
+import asyncio
+import heapq
+import time
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+pytest.importorskip("profanity_check")
+
+from syng.entry import Entry  # noqa: E402
+from syng.queue import Queue  # noqa: E402
+from syng.server import Client, Server, State, _secret_matches  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("given", "expected", "matches"),
+    [
+        ("secret", "secret", True),
+        ("secret", "Secret", False),
+        ("", "", True),
+        ("secret", "secret2", False),
+        (None, "None", False),
+        (123, "123", False),
+        (None, None, False),
+        ("123", 123, False),
+        (["secret"], "secret", False),
+    ],
+)
+def test_secret_matches(given: Any, expected: Any, matches: bool) -> None:
+    assert _secret_matches(given, expected) is matches
+
+
+def make_state(room: str = "ROOM") -> State:
+    return State(
+        queue=Queue([]),
+        waiting_room={},
+        recent=[],
+        sid="playback-sid",
+        client=Client(sources={}, sources_prio=(), config={}),
+        room=room,
+    )
+
+
+def record_sends(server: Server) -> list[tuple[State, str]]:
+    sent: list[tuple[State, str]] = []
+
+    async def send_state(state: State, sid: str) -> None:
+        sent.append((state, sid))
+
+    server.send_state = send_state  # type: ignore[method-assign]
+    return sent
+
+
+def test_broadcasts_are_coalesced_and_sent_to_the_room() -> None:
+    async def run() -> None:
+        server = Server()
+        sent = record_sends(server)
+        state = make_state()
+
+        # The playback client is not connected, the room still gets the state
+        await server.broadcast_state(state)
+        await server.broadcast_state(state)
+        assert sent == []
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert sent == [(state, "ROOM")]
+        assert not state.broadcast_pending
+
+    asyncio.run(run())
+
+
+def test_flush_state_sends_pending_broadcast_once() -> None:
+    async def run() -> None:
+        server = Server()
+        sent = record_sends(server)
+        state = make_state()
+
+        await server.flush_state(state)
+        assert sent == []
+
+        await server.broadcast_state(state)
+        await server.flush_state(state)
+        assert sent == [(state, "ROOM")]
+
+        # The scheduled task finds nothing left to send
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert sent == [(state, "ROOM")]
+
+    asyncio.run(run())
+
+
+def test_cleanup_removes_only_rooms_idle_for_four_hours() -> None:
+    async def run() -> None:
+        server = Server()
+        now = time.monotonic()
+        hours = 3600
+        rooms = {
+            "STALE": now - 5 * hours,
+            # Pushed long ago, but seen since then
+            "REFRESHED": now - 5 * hours,
+            "FRESH": now - 1 * hours,
+        }
+        for room, pushed_at in rooms.items():
+            server.clients[room] = make_state(room)
+            server.clients[room].last_seen = pushed_at
+            heapq.heappush(server._expiry_heap, (pushed_at, room))
+        server.clients["REFRESHED"].last_seen = now
+
+        participants = {"STALE": ["a", "b"], "REFRESHED": ["c"], "FRESH": ["d"]}
+        disconnected: list[str] = []
+
+        def get_participants(namespace: str, room: str) -> list[tuple[str, str]]:
+            return [(sid, sid) for sid in participants[room]]
+
+        async def disconnect(sid: str) -> None:
+            disconnected.append(sid)
+
+        server.sio.manager.get_participants = get_participants  # type: ignore[method-assign,assignment]
+        server.sio.disconnect = disconnect  # type: ignore[method-assign]
+
+        await server.cleanup()
+
+        assert set(server.clients) == {"REFRESHED", "FRESH"}
+        assert sorted(disconnected) == ["a", "b"]
+        assert sorted(room for _, room in server._expiry_heap) == ["FRESH", "REFRESHED"]
+        assert (now, "REFRESHED") in server._expiry_heap
+
+    asyncio.run(run())
+
+
+def make_entry(performer: str) -> Entry:
+    return Entry(
+        ident=performer,
+        source="files",
+        duration=100,
+        title="Title",
+        artist="Artist",
+        album="Album",
+        performer=performer,
+    )
+
+
+ADMIN_SID = "admin-sid"
+
+
+def setup_admin_room(server: Server, *entries: Entry, waiting: tuple[Entry, ...] = ()) -> State:
+    """Create a room with the entries, and an admin connection to it."""
+    state = make_state()
+    state.client.config.update(preview_duration=3, last_song=None)
+    for entry in entries:
+        state.queue.append(entry)
+    state.waiting_room.update((str(entry.uuid), entry) for entry in waiting)
+    server.clients["ROOM"] = state
+    server.rooms_by_sid[ADMIN_SID] = "ROOM"
+    server.admins.add(ADMIN_SID)
+
+    async def emit(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    server.sio.emit = emit  # type: ignore[method-assign]
+    return state
+
+
+def test_skipping_a_queued_entry_promotes_the_waiting_room() -> None:
+    async def run() -> None:
+        server = Server()
+        alice, bob, alice_again = make_entry("Alice"), make_entry("Bob"), make_entry("Alice")
+        state = setup_admin_room(server, alice, bob, waiting=(alice_again,))
+
+        await server.handle_skip(ADMIN_SID, {"uuid": str(alice.uuid)})
+
+        assert list(state.queue) == [bob, alice_again]
+        assert state.waiting_room == {}
+        assert state.broadcast_pending
+
+    asyncio.run(run())
+
+
+def test_waiting_room_entry_moves_to_the_queue() -> None:
+    async def run() -> None:
+        server = Server()
+        alice, alice_again, bob = make_entry("Alice"), make_entry("Alice"), make_entry("Bob")
+        state = setup_admin_room(server, alice, waiting=(alice_again, bob))
+
+        await server.handle_waiting_room_to_queue(ADMIN_SID, {"uuid": str(alice_again.uuid)})
+        await server.handle_waiting_room_to_queue(ADMIN_SID, {"uuid": str(uuid4())})
+
+        assert list(state.queue) == [alice, alice_again]
+        assert list(state.waiting_room.values()) == [bob]
+
+    asyncio.run(run())
+
+
+def test_skipping_a_waiting_entry_removes_it() -> None:
+    async def run() -> None:
+        server = Server()
+        alice, alice_again = make_entry("Alice"), make_entry("Alice")
+        state = setup_admin_room(server, alice, waiting=(alice_again,))
+
+        await server.handle_skip(ADMIN_SID, {"uuid": str(alice_again.uuid)})
+
+        assert list(state.queue) == [alice]
+        assert state.waiting_room == {}
+        assert state.broadcast_pending
+
+    asyncio.run(run())
+
+
+def test_skipping_an_unknown_uuid_does_not_broadcast() -> None:
+    async def run() -> None:
+        server = Server()
+        alice, alice_again = make_entry("Alice"), make_entry("Alice")
+        state = setup_admin_room(server, alice, waiting=(alice_again,))
+
+        await server.handle_skip(ADMIN_SID, {"uuid": str(uuid4())})
+
+        assert list(state.queue) == [alice]
+        assert list(state.waiting_room.values()) == [alice_again]
+        assert not state.broadcast_pending
+
+    asyncio.run(run())
+
+
+def test_static_files_are_cached_and_revalidated(tmp_path: Path) -> None:
+    async def run() -> None:
+        (tmp_path / "index.html").write_bytes(b"<html></html>")
+        (tmp_path / "favicon.ico").write_bytes(b"icon")
+        server = Server()
+        server.app["root_folder"] = str(tmp_path)
+
+        response = await server.root_handler(make_mocked_request("GET", "/ROOM"))
+        assert response.status == 200
+        assert response.body == b"<html></html>"
+        assert response.content_type == "text/html"
+        etag = response.headers["ETag"]
+
+        # Later changes on disk are not picked up
+        (tmp_path / "index.html").write_bytes(b"changed")
+        response = await server.root_handler(make_mocked_request("GET", "/"))
+        assert response.body == b"<html></html>"
+        assert response.headers["ETag"] == etag
+
+        response = await server.root_handler(
+            make_mocked_request("GET", "/ROOM", headers={"If-None-Match": etag})
+        )
+        assert response.status == 304
+        assert response.headers["ETag"] == etag
+
+        response = await server.root_handler(
+            make_mocked_request("GET", "/favicon.ico", headers={"If-None-Match": etag})
+        )
+        assert response.status == 200
+        assert response.body == b"icon"
+        assert response.content_type == "image/x-icon"
+
+    asyncio.run(run())
+
+
+def test_missing_static_file_is_not_found(tmp_path: Path) -> None:
+    async def run() -> None:
+        server = Server()
+        server.app["root_folder"] = str(tmp_path)
+        with pytest.raises(web.HTTPNotFound):
+            await server.root_handler(make_mocked_request("GET", "/"))
+
+    asyncio.run(run())
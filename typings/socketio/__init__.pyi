@@ -1,4 +1,5 @@
 from typing import Any, Awaitable
+from typing import Iterator
 from typing import Callable
 from typing import Optional
 from typing import TypeVar, TypeAlias
@@ -11,7 +12,11 @@ class _session_context_manager:
     async def __aenter__(self) -> dict[str, Any]: ...
     async def __aexit__(self, *args: list[Any]) -> None: ...
 
+class AsyncManager:
+    def get_participants(self, namespace: str, room: str) -> Iterator[tuple[str, str]]: ...
+
 class AsyncServer:
+    manager: AsyncManager
     def __init__(
         self,
         cors_allowed_origins: str,